@@ -3,26 +3,60 @@
 Self-test for cicd/utils/run_contract.py
 
 Exercises the full contract lifecycle (init -> record-produced ->
-mark-task -> preflight -> finalize) using only local temp files.
+mark-task -> append-event -> preflight -> finalize) using only local temp files.
 No GCS calls, no network, no mocks — just proves the tool runs
 end-to-end and produces valid JSON with the expected schema.
 
-Usage:  python3 cicd/tests/test_run_contract.py <cicd_root>
+Commands run in-process against the imported module by default; pass
+--subprocess to spawn a fresh interpreter per command instead.
+
+Usage:  python3 cicd/tests/test_run_contract.py <cicd_root> [--subprocess]
 """
 
 from __future__ import annotations
 
+import contextlib
+import importlib.util
+import io
 import json
+import math
 import shutil
 import subprocess
 import sys
 import tempfile
 from pathlib import Path
+from types import ModuleType
+
+_USE_SUBPROCESS = False
+_RC_MODULE: ModuleType | None = None
+
+
+def _load_run_contract(cicd_root: Path) -> ModuleType:
+    global _RC_MODULE
+    if _RC_MODULE is None:
+        spec = importlib.util.spec_from_file_location(
+            "run_contract", cicd_root / "utils" / "run_contract.py"
+        )
+        assert spec is not None and spec.loader is not None
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _RC_MODULE = module
+    return _RC_MODULE
 
 
 def run_cmd(cicd_root: Path, *args: str) -> subprocess.CompletedProcess:
-    cmd = [sys.executable, str(cicd_root / "utils" / "run_contract.py"), *args]
-    return subprocess.run(cmd, capture_output=True, text=True)
+    if _USE_SUBPROCESS:
+        cmd = [sys.executable, str(cicd_root / "utils" / "run_contract.py"), *args]
+        return subprocess.run(cmd, capture_output=True, text=True)
+
+    module = _load_run_contract(cicd_root)
+    out, err = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        try:
+            code = module.main(list(args))
+        except SystemExit as exc:
+            code = exc.code if isinstance(exc.code, int) else 1
+    return subprocess.CompletedProcess(list(args), code, out.getvalue(), err.getvalue())
 
 
 def check(label: str, condition: bool, detail: str = "") -> None:
@@ -35,11 +69,16 @@ def check(label: str, condition: bool, detail: str = "") -> None:
 
 
 def main() -> int:
-    if len(sys.argv) < 2:
-        print("Usage: test_run_contract.py <cicd_root>", file=sys.stderr)
+    global _USE_SUBPROCESS
+    argv = sys.argv[1:]
+    if "--subprocess" in argv:
+        _USE_SUBPROCESS = True
+        argv.remove("--subprocess")
+    if not argv:
+        print("Usage: test_run_contract.py <cicd_root> [--subprocess]", file=sys.stderr)
         return 1
 
-    cicd_root = Path(sys.argv[1]).resolve()
+    cicd_root = Path(argv[0]).resolve()
     rc_script = cicd_root / "utils" / "run_contract.py"
     if not rc_script.exists():
         print(f"run_contract.py not found at {rc_script}", file=sys.stderr)
@@ -71,9 +110,13 @@ def _run_tests(cicd_root: Path, tmp: Path) -> int:
             "uri": "gs://fake-bucket/test/output_b.jsonl",
         },
     ]
+    # json.dumps writes NaN by default, and ints outside orjson's range must stay exact.
+    big_int = 2 ** 70
+    big_negative = -9999999999999999999  # 19 digits, below -2**63
     init_json.write_text(json.dumps({
         "expected_assets": expected_assets,
-        "config": {"test_key": "test_value"},
+        "config": {"test_key": "test_value", "nan_value": float("nan"),
+                   "big_int": big_int, "big_negative": big_negative},
     }))
 
     # ---- 1. init ----
@@ -93,6 +136,13 @@ def _run_tests(cicd_root: Path, tmp: Path) -> int:
     check("assets is a list", isinstance(contract.get("assets"), list))
     check("2 assets registered", len(contract["assets"]) == 2,
           f"got {len(contract['assets'])}")
+    config = contract.get("configuration", {})
+    check("NaN config value preserved", math.isnan(config.get("nan_value", 0.0)),
+          repr(config.get("nan_value")))
+    check("big int config value exact", config.get("big_int") == big_int,
+          repr(config.get("big_int")))
+    check("big negative int config value exact", config.get("big_negative") == big_negative,
+          repr(config.get("big_negative")))
 
     # ---- 2. record-produced ----
     r = run_cmd(
@@ -120,6 +170,24 @@ def _run_tests(cicd_root: Path, tmp: Path) -> int:
     task = next(t for t in contract["tasks"] if t["task_id"] == "selftest-task")
     check("task status is succeeded", task["status"] == "succeeded")
 
+    # ---- 3b. append-event (queued, applied by finalize) ----
+    events_file = contract_file.with_name(contract_file.name + ".events.jsonl")
+    r = run_cmd(
+        cicd_root, "append-event",
+        "--contract-file", str(contract_file),
+        "--task-id", "selftest-task",
+        "--asset-id", "test/output_b",
+        "--uri", "gs://fake-bucket/test/output_b.jsonl",
+    )
+    check("append-event exits 0", r.returncode == 0, r.stderr)
+    check("events file created", events_file.exists())
+
+    contract = json.loads(contract_file.read_text())
+    asset_b = next(a for a in contract["assets"] if a["asset_id"] == "test/output_b")
+    check("append-event leaves contract untouched", asset_b.get("produced") is not True)
+    with events_file.open("a") as fh:
+        fh.write('{"op": "produced", "task_id": "selfte')  # writer killed mid-append
+
     # ---- 4. preflight (no real GCS — inputs will show as unknown) ----
     r = run_cmd(
         cicd_root, "preflight",
@@ -142,6 +210,18 @@ def _run_tests(cicd_root: Path, tmp: Path) -> int:
     v = contract["verification"]
     check("asset_status_counts present", "asset_status_counts" in v)
     check("finished_at present", "finished_at" in v)
+    config = contract.get("configuration", {})
+    check("NaN/big int survive finalize",
+          math.isnan(config.get("nan_value", 0.0)) and config.get("big_int") == big_int
+          and config.get("big_negative") == big_negative)
+
+    asset_b = next(a for a in contract["assets"] if a["asset_id"] == "test/output_b")
+    check("finalize replays queued events", asset_b.get("produced") is True)
+    check("events file consumed", not events_file.exists())
+    replay = v.get("event_replay") or {}
+    check("torn event line skipped, not fatal",
+          replay.get("applied") == 1 and [e.get("line") for e in replay.get("skipped_lines", [])] == [2],
+          repr(replay))
 
     for asset in contract["assets"]:
         check(f"asset {asset['asset_id']} has status field", "status" in asset)
@@ -9,20 +9,65 @@ Pipeline-agnostic — works from local shells, Cloud Build, VMs, and Cloud Run.
 from __future__ import annotations
 
 import argparse
+import bisect
+import contextlib
 import datetime as dt
+import functools
 import glob
 import hashlib
 import json
 import os
 import re
+import shutil
 import subprocess
 import sys
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from string import Template
-from typing import Any, Dict, Iterable, List, Mapping, MutableMapping, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, MutableMapping, Tuple
+
+try:  # Optional: in-process GCS access; gsutil is used when unavailable.
+    from google.cloud import storage as gcs_storage
+except ImportError:  # pragma: no cover - depends on the image
+    gcs_storage = None
+
+try:  # POSIX only: serializes event appends against replay claims.
+    import fcntl
+except ImportError:  # pragma: no cover - e.g. Windows
+    fcntl = None
+
+try:  # Optional: faster JSON codec; stdlib json is used when unavailable.
+    import orjson
+except ImportError:  # pragma: no cover - depends on the image
+    orjson = None
 
 SCHEMA_VERSION = 1
+MAX_PROBE_WORKERS = 32
+# GCS concurrency caps. Each gsutil call is a separate interpreter with its own
+# auth stack, so keep few in flight; the client's requests session keeps 10
+# connections per host (pool_maxsize default), and more threads than that just
+# churn connections.
+MAX_GSUTIL_WORKERS = 4
+GCS_CLIENT_POOL_SIZE = 10
+MATCHED_OUTPUTS_LIMIT = 200
+# Resumable-upload chunk size. Only uploads over 8 MiB go resumable and use
+# this; smaller files are sent as a single multipart request that ignores it.
+GCS_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Per-asset / per-folder report lines, newline included; buffered and written
+# with writelines (printf-style: padded fields format faster).
+_PREFLIGHT_LINE_FMT = "  %s %-30s %s%s\n"
+_FOLDER_UPLOADED_FMT = "  uploaded: %s (%d assets)\n"
+_UPLOAD_FAILED_FMT = "  FAILED:   %s: %s\n"
+
+_SLUG_RE = re.compile(r"[^A-Za-z0-9_.-]+")
+_MULTISLASH_RE = re.compile(r"/{2,}")
+
+# One pass over a template string: "$$" escape, ${VAR}, $VAR, and {VAR}.
+_TEMPLATE_RE = re.compile(
+    r"\$(?:(\$)|\{([_A-Za-z][_A-Za-z0-9]*)\}|([_A-Za-z][_A-Za-z0-9]*))|\{([^{}$]+)\}"
+)
 
 
 def _utc_now_iso() -> str:
@@ -30,32 +75,208 @@ def _utc_now_iso() -> str:
 
 
 def _safe_slug(value: str) -> str:
-    slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", str(value)).strip("._-")
+    slug = _SLUG_RE.sub("_", str(value)).strip("._-")
     return slug or "run"
 
 
-def _atomic_write_text(path: Path, text: str) -> None:
+def _write_all(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _atomic_write_bytes(path: Path, data: bytes) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    tmp = path.with_suffix(path.suffix + ".tmp")
-    tmp.write_text(text, encoding="utf-8")
-    tmp.replace(path)
+    tmp = str(path) + ".tmp"
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        _write_all(fd, data)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp, path)
+    # Persist the rename itself; not every platform can fsync a directory.
+    try:
+        dir_fd = os.open(str(path.parent), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+
+def _atomic_write_text(path: Path, text: str) -> None:
+    _atomic_write_bytes(path, text.encode("utf-8"))
+
+
+# orjson reads integers outside [-2**63, 2**64 - 1] as floats. Every such value
+# has at least 19 digits, so any 19+ digit run sends the document to stdlib json
+# instead (false positives, e.g. inside strings, only cost speed).
+_LONG_DIGITS_RE = re.compile(rb"[0-9]{19,}")
+# Set once stdlib json had to parse an input (NaN/Infinity, big ints, lone
+# surrogates): those values may now be anywhere in the contract, and orjson
+# would write NaN as null, so serialization stays on stdlib for the rest of
+# the command (main() resets it).
+_STDLIB_JSON_VALUES = False
+
+
+def _json_loads(data: bytes | str) -> Any:
+    global _STDLIB_JSON_VALUES
+    if orjson is not None:
+        raw = data.encode("utf-8", errors="surrogatepass") if isinstance(data, str) else data
+        if not _LONG_DIGITS_RE.search(raw):
+            try:
+                return orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                pass  # e.g. NaN, which json.dumps writes by default
+        value = json.loads(data)
+        _STDLIB_JSON_VALUES = True
+        return value
+    return json.loads(data)
 
 
-def _atomic_write_json(path: Path, payload: Any) -> None:
-    _atomic_write_text(path, json.dumps(payload, indent=2, sort_keys=True) + "\n")
+def _json_dumps_bytes(payload: Any, *, canonical: bool = True) -> bytes:
+    """JSON as UTF-8 bytes with a trailing newline.
+
+    canonical=True gives indented, key-sorted output for final artifacts;
+    canonical=False gives compact output in insertion order.
+    """
+    if orjson is not None and not _STDLIB_JSON_VALUES:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+        if canonical:
+            option |= orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(payload, option=option)
+        except TypeError:
+            pass  # e.g. ints beyond 64 bits; stdlib json handles those.
+    if canonical:
+        text = json.dumps(payload, indent=2, sort_keys=True)
+    else:
+        text = json.dumps(payload, separators=(",", ":"))
+    return (text + "\n").encode("utf-8")
+
+
+def _atomic_write_json(path: Path, payload: Any, *, canonical: bool = True) -> None:
+    _atomic_write_bytes(path, _json_dumps_bytes(payload, canonical=canonical))
 
 
 def _load_json_file(path: Path) -> Any:
-    return json.loads(path.read_text(encoding="utf-8"))
+    return _json_loads(path.read_bytes())
 
 
+@functools.lru_cache(maxsize=None)
 def _command_exists(cmd: str) -> bool:
+    if shutil.which(cmd) is not None:
+        return True
+    # Fall back to a login shell, which may add the Cloud SDK to PATH.
     return subprocess.run(["bash", "-lc", f"command -v {cmd}"], capture_output=True).returncode == 0
 
 
+_GCS_CLIENT: Any = None
+_GCS_CLIENT_LOCK = threading.Lock()
+
+
+def _gcs_client() -> Any:
+    """Shared google-cloud-storage client, or None to fall back to gsutil."""
+    global _GCS_CLIENT
+    if gcs_storage is None:
+        return None
+    with _GCS_CLIENT_LOCK:
+        if _GCS_CLIENT is None:
+            try:
+                _GCS_CLIENT = gcs_storage.Client()
+            except Exception:
+                _GCS_CLIENT = False
+    return _GCS_CLIENT or None
+
+
+def _pool_workers(count: int, cap: int, *, gcs: bool) -> int:
+    """Thread count for `count` jobs, tighter when they hit GCS."""
+    if gcs:
+        cap = min(cap, GCS_CLIENT_POOL_SIZE if _gcs_client() is not None else MAX_GSUTIL_WORKERS)
+    return max(1, min(cap, count))
+
+
+def _split_gs_uri(uri: str) -> Tuple[str, str]:
+    bucket, _, key = str(uri)[len("gs://"):].partition("/")
+    return bucket, key
+
+
+def _gcs_wildcard_regex(pattern: str) -> re.Pattern[str]:
+    """Translate a gsutil wildcard (*, **, ?, [...]) over object names to a regex."""
+    out: List[str] = []
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+            continue
+        if ch == "*":
+            out.append("[^/]*")
+        elif ch == "?":
+            out.append("[^/]")
+        elif ch == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                out.append(re.escape(ch))
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append("[" + body.replace("\\", "\\\\") + "]")
+                i = end
+        else:
+            out.append(re.escape(ch))
+        i += 1
+    return re.compile("".join(out) + r"\Z")
+
+
+def _gcs_client_ls(client: Any, pattern: str, *, recursive: bool) -> Tuple[List[str] | None, str]:
+    """Client-side equivalent of `gsutil ls [-r] pattern`."""
+    bucket, key = _split_gs_uri(pattern)
+    wildcard_at = min((key.find(ch) for ch in "*?[" if ch in key), default=-1)
+    try:
+        if not recursive:
+            # Objects directly under a folder; pattern names the folder.
+            prefix = key if not key or key.endswith("/") else key + "/"
+            names = [b.name for b in client.list_blobs(bucket, prefix=prefix, delimiter="/")]
+        elif wildcard_at == -1:
+            # An object, or everything below the prefix.
+            folder = key.rstrip("/") + "/"
+            names = [
+                b.name
+                for b in client.list_blobs(bucket, prefix=key or None)
+                if not key or b.name == key or b.name.startswith(folder)
+            ]
+        else:
+            # Like `ls -r`, a match on a parent folder lists everything below it.
+            regex = _gcs_wildcard_regex(key)
+            names = []
+            for b in client.list_blobs(bucket, prefix=key[:wildcard_at] or None):
+                name = b.name
+                if regex.match(name) or any(
+                    regex.match(name[:idx]) for idx in range(wildcard_at, len(name)) if name[idx] == "/"
+                ):
+                    names.append(name)
+    except Exception as exc:
+        return (None, f"gcs_list_failed:{exc}")
+
+    out = {_normalize_gs_uri(f"gs://{bucket}/{name}") for name in names if not name.endswith("/")}
+    return (list(out), "gcs_glob")
+
+
+def _resolve_path(path: str) -> Path:
+    """Path(path).expanduser().resolve() via a single os.path.realpath call."""
+    return Path(os.path.realpath(os.path.expanduser(path)))
+
+
 def _normalize_local_path(path: str) -> str:
     try:
-        return str(Path(path).expanduser().resolve())
+        return os.path.realpath(os.path.expanduser(path))
     except Exception:
         return str(Path(path).expanduser())
 
@@ -64,13 +285,13 @@ def _normalize_gs_uri(uri: str) -> str:
     value = str(uri).strip()
     if not value.startswith("gs://"):
         return value
-    prefix, _, rest = value.partition("gs://")
-    del prefix
-    while "//" in rest:
-        rest = rest.replace("//", "/")
+    rest = _MULTISLASH_RE.sub("/", value[len("gs://"):])
     return "gs://" + rest.rstrip("/")
 
 
+# Runtime detection reads environment variables that are fixed for the
+# lifetime of the process, so both helpers are computed once.
+@functools.lru_cache(maxsize=1)
 def _infer_runtime_kind() -> str:
     if os.getenv("K_SERVICE") or os.getenv("CLOUD_RUN_JOB"):
         return "cloud_run"
@@ -81,7 +302,8 @@ def _infer_runtime_kind() -> str:
     return "local"
 
 
-def _runtime_metadata() -> Dict[str, Any]:
+@functools.lru_cache(maxsize=1)
+def _runtime_metadata_items() -> Tuple[Tuple[str, Any], ...]:
     kind = _infer_runtime_kind()
     meta: Dict[str, Any] = {
         "runtime": kind,
@@ -104,7 +326,11 @@ def _runtime_metadata() -> Dict[str, Any]:
                 "cloud_run_task_index": os.getenv("CLOUD_RUN_TASK_INDEX"),
             }
         )
-    return meta
+    return tuple(meta.items())
+
+
+def _runtime_metadata() -> Dict[str, Any]:
+    return dict(_runtime_metadata_items())
 
 
 def _default_run_id(job_id: str) -> str:
@@ -137,9 +363,9 @@ def _parse_bool(raw: str | None, default: bool = False) -> bool:
 def _parse_vars(pairs: Iterable[str]) -> Dict[str, str]:
     out: Dict[str, str] = {}
     for pair in pairs:
-        if "=" not in pair:
+        key, sep, value = pair.partition("=")
+        if not sep:
             raise ValueError(f"Invalid --var value {pair!r}; expected KEY=VALUE")
-        key, value = pair.split("=", 1)
         key = key.strip()
         if not key:
             raise ValueError(f"Invalid --var value {pair!r}; empty key")
@@ -148,28 +374,88 @@ def _parse_vars(pairs: Iterable[str]) -> Dict[str, str]:
 
 
 def _to_string_context(source: Mapping[str, Any]) -> Dict[str, str]:
-    out: Dict[str, str] = {}
-    for key, value in source.items():
-        if value is None:
-            continue
-        out[str(key)] = str(value)
-    return out
+    return {
+        key if type(key) is str else str(key): value if type(value) is str else str(value)
+        for key, value in source.items()
+        if value is not None
+    }
 
 
-def _apply_templates(value: Any, context: Mapping[str, str]) -> Any:
-    if isinstance(value, str):
-        rendered = Template(value).safe_substitute(context)
-        # Also support {VAR} style placeholders for convenience.
-        for key, ctx_value in context.items():
-            rendered = rendered.replace("{" + key + "}", str(ctx_value))
+def _render_template(value: str, context: Mapping[str, str]) -> str:
+    # string.Template.safe_substitute semantics, plus {VAR} style placeholders
+    # for convenience. Unknown names are left untouched.
+    def _sub(match: re.Match[str]) -> str:
+        if match.group(1):
+            return "$"
+        name = match.group(2) or match.group(3) or match.group(4)
+        if name in context:
+            return str(context[name])
+        return match.group(0)
+
+    return _TEMPLATE_RE.sub(_sub, value)
+
+
+def _apply_templates(
+    value: Any,
+    context: Mapping[str, str],
+    cache: Dict[str, str] | None = None,
+) -> Any:
+    """Render templates in strings nested anywhere inside value.
+
+    Returns new containers and never mutates value. Walks with an explicit
+    stack so deep specs cost no Python frames. cache, if given, memoizes
+    rendered strings; it must only ever be used with one context.
+    """
+
+    def render(text: str) -> str:
+        if cache is None:
+            return _render_template(text, context)
+        rendered = cache.get(text)
+        if rendered is None:
+            rendered = cache[text] = _render_template(text, context)
         return rendered
-    if isinstance(value, list):
-        return [_apply_templates(v, context) for v in value]
-    if isinstance(value, tuple):
-        return tuple(_apply_templates(v, context) for v in value)
-    if isinstance(value, dict):
-        return {k: _apply_templates(v, context) for k, v in value.items()}
-    return value
+
+    if isinstance(value, str):
+        return render(value)
+    if not isinstance(value, (list, tuple, dict)):
+        return value
+
+    # Tuples are built as lists and frozen afterwards; reversed discovery
+    # order freezes children before their parents.
+    to_freeze: List[Tuple[Any, Any, List[Any]]] = []
+
+    def new_container(node: Any, parent: Any, key: Any) -> Any:
+        if isinstance(node, dict):
+            return {}
+        out: List[Any] = []
+        if isinstance(node, tuple):
+            to_freeze.append((parent, key, out))
+        return out
+
+    result = new_container(value, None, None)
+    stack = [(value, result)]
+    while stack:
+        src, out = stack.pop()
+        out_is_dict = isinstance(out, dict)
+        for key, child in (src.items() if isinstance(src, dict) else enumerate(src)):
+            if isinstance(child, str):
+                new = render(child)
+            elif isinstance(child, (list, tuple, dict)):
+                new = new_container(child, out, key)
+                stack.append((child, new))
+            else:
+                new = child
+            if out_is_dict:
+                out[key] = new
+            else:
+                out.append(new)
+
+    for parent, key, items in reversed(to_freeze):
+        if parent is None:
+            result = tuple(items)
+        else:
+            parent[key] = tuple(items)
+    return result
 
 
 def _load_job_definition(spec_path: Path | None, job_id: str) -> Tuple[Dict[str, Any], str]:
@@ -206,6 +492,16 @@ def _load_job_definition(spec_path: Path | None, job_id: str) -> Tuple[Dict[str,
     return dict(job_def), str(resolved_job_id)
 
 
+def _as_list(value: Any) -> List[Any]:
+    """value itself if it is a list, else list(value or []); read-only use."""
+    return value if type(value) is list else list(value or [])
+
+
+def _as_dict(value: Any) -> Dict[Any, Any]:
+    """value itself if it is a dict, else dict(value or {}); read-only use."""
+    return value if type(value) is dict else dict(value or {})
+
+
 def _normalize_tasks_and_assets(
     *,
     job_id: str,
@@ -216,15 +512,15 @@ def _normalize_tasks_and_assets(
     expected_inputs_override: List[Mapping[str, Any]] | None = None,
     context: Mapping[str, str],
 ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
-    tasks_raw = list(job_def.get("tasks") or [])
+    tasks_raw = _as_list(job_def.get("tasks"))
 
     if expected_assets_override is not None or expected_inputs_override is not None:
         tasks_raw = [
             {
                 "task_id": str(job_def.get("default_task_id") or job_id),
-                "labels": dict(job_def.get("default_labels") or {}),
-                "expected_assets": list(expected_assets_override or job_def.get("expected_assets") or []),
-                "expected_inputs": list(expected_inputs_override or job_def.get("expected_inputs") or []),
+                "labels": _as_dict(job_def.get("default_labels")),
+                "expected_assets": _as_list(expected_assets_override or job_def.get("expected_assets")),
+                "expected_inputs": _as_list(expected_inputs_override or job_def.get("expected_inputs")),
             }
         ]
 
@@ -233,16 +529,16 @@ def _normalize_tasks_and_assets(
             tasks_raw = [
                 {
                     "task_id": str(job_def.get("default_task_id") or job_id),
-                    "labels": dict(job_def.get("default_labels") or {}),
-                    "expected_assets": list(job_def.get("expected_assets") or []),
-                    "expected_inputs": list(job_def.get("expected_inputs") or []),
+                    "labels": _as_dict(job_def.get("default_labels")),
+                    "expected_assets": _as_list(job_def.get("expected_assets")),
+                    "expected_inputs": _as_list(job_def.get("expected_inputs")),
                 }
             ]
         else:
             tasks_raw = [
                 {
                     "task_id": str(job_def.get("default_task_id") or job_id),
-                    "labels": dict(job_def.get("default_labels") or {}),
+                    "labels": _as_dict(job_def.get("default_labels")),
                     "expected_assets": [],
                     "expected_inputs": [],
                 }
@@ -250,6 +546,8 @@ def _normalize_tasks_and_assets(
 
     tasks: List[Dict[str, Any]] = []
     assets: List[Dict[str, Any]] = []
+    # Specs repeat the same templated strings across tasks and assets.
+    render_cache: Dict[str, str] = {}
     seen_tasks: set[str] = set()
     seen_assets: set[str] = set()
 
@@ -258,14 +556,14 @@ def _normalize_tasks_and_assets(
             raise ValueError(f"Task definition #{task_index} must be an object")
 
         task_id_raw = task_raw.get("task_id") or f"{job_id}/task_{task_index}"
-        task_id = str(_apply_templates(str(task_id_raw), context))
+        task_id = str(_apply_templates(str(task_id_raw), context, render_cache))
         if not task_id:
             raise ValueError(f"Task definition #{task_index} resolved to empty task_id")
         if task_id in seen_tasks:
             raise ValueError(f"Duplicate task_id in contract definition: {task_id}")
         seen_tasks.add(task_id)
 
-        labels = _apply_templates(dict(task_raw.get("labels") or {}), context)
+        labels = _apply_templates(_as_dict(task_raw.get("labels")), context, render_cache)
         task_record = {
             "task_id": task_id,
             "labels": labels,
@@ -280,9 +578,9 @@ def _normalize_tasks_and_assets(
 
         # Build combined list: (asset_raw, role) for outputs and inputs
         role_tagged: List[Tuple[Mapping[str, Any], str]] = []
-        for a in list(task_raw.get("expected_assets") or []):
+        for a in _as_list(task_raw.get("expected_assets")):
             role_tagged.append((a, "output"))
-        for a in list(task_raw.get("expected_inputs") or []):
+        for a in _as_list(task_raw.get("expected_inputs")):
             role_tagged.append((a, "input"))
 
         for asset_index, (asset_raw, role) in enumerate(role_tagged, start=1):
@@ -293,7 +591,7 @@ def _normalize_tasks_and_assets(
 
             default_suffix = "asset" if role == "output" else "input"
             asset_id_raw = asset_raw.get("asset_id") or f"{task_id}/{default_suffix}_{asset_index}"
-            asset_id = str(_apply_templates(str(asset_id_raw), context))
+            asset_id = str(_apply_templates(str(asset_id_raw), context, render_cache))
             if asset_id in seen_assets:
                 raise ValueError(f"Duplicate asset_id in contract definition: {asset_id}")
             seen_assets.add(asset_id)
@@ -309,15 +607,15 @@ def _normalize_tasks_and_assets(
                 "role": role,
                 "kind": str(asset_raw.get("kind") or "output"),
                 "required": bool(asset_raw.get("required", True)),
-                "uri": _apply_templates(uri, context) if uri is not None else None,
-                "local_path": _apply_templates(local_path, context)
+                "uri": _apply_templates(uri, context, render_cache) if uri is not None else None,
+                "local_path": _apply_templates(local_path, context, render_cache)
                 if local_path is not None
                 else None,
-                "local_glob": _apply_templates(local_glob, context)
+                "local_glob": _apply_templates(local_glob, context, render_cache)
                 if local_glob is not None
                 else None,
-                "gcs_glob": _apply_templates(gcs_glob, context) if gcs_glob is not None else None,
-                "extra": _apply_templates(dict(asset_raw.get("extra") or {}), context),
+                "gcs_glob": _apply_templates(gcs_glob, context, render_cache) if gcs_glob is not None else None,
+                "extra": _apply_templates(_as_dict(asset_raw.get("extra")), context, render_cache),
                 "expected": True,
                 "produced": False,
                 "status": "expected",
@@ -420,21 +718,50 @@ def _asset_index(contract: Mapping[str, Any]) -> Dict[str, Dict[str, Any]]:
     return {str(asset.get("asset_id")): asset for asset in contract.get("assets", [])}
 
 
-def _write_contract(contract: Mapping[str, Any]) -> None:
-    """Write _run_contract.json to disk."""
+# In-memory lookup indices kept on the contract dict; never written to disk.
+_TASK_IDX_KEY = "_task_idx"
+_ASSET_IDX_KEY = "_asset_idx"
+
+
+def _record_index(
+    contract: MutableMapping[str, Any], list_key: str, id_key: str, idx_key: str
+) -> Dict[str, Dict[str, Any]]:
+    idx = contract.get(idx_key)
+    if idx is None:
+        idx = {}
+        for rec in contract.setdefault(list_key, []):
+            idx.setdefault(str(rec.get(id_key)), rec)
+        contract[idx_key] = idx
+    return idx
+
+
+def _write_contract(contract: Mapping[str, Any], *, canonical: bool = False) -> None:
+    """Write _run_contract.json to disk.
+
+    Intermediate writes are compact; finalize, and any write that is about
+    to be uploaded, uses the canonical form.
+    """
     paths = contract.get("paths", {})
     contract_json = Path(str(paths.get("contract_json") or "_run_contract.json"))
-    _atomic_write_json(contract_json, contract)
+    _atomic_write_json(contract_json, _contract_payload(contract), canonical=canonical)
+
 
+def _contract_payload(contract: Mapping[str, Any]) -> Dict[str, Any]:
+    """The contract as persisted: without the in-memory lookup indices."""
+    return {k: v for k, v in contract.items() if k not in (_TASK_IDX_KEY, _ASSET_IDX_KEY)}
 
-def _ensure_task(contract: MutableMapping[str, Any], task_id: str) -> Dict[str, Any]:
+
+def _ensure_task(
+    contract: MutableMapping[str, Any], task_id: str, now_iso: str | None = None
+) -> Dict[str, Any]:
     tasks = contract.setdefault("tasks", [])
     assert isinstance(tasks, list)
-    for task in tasks:
-        if str(task.get("task_id")) == task_id:
-            return task
+    index = _record_index(contract, "tasks", "task_id", _TASK_IDX_KEY)
+    existing = index.get(task_id)
+    if existing is not None:
+        return existing
 
-    now_iso = _utc_now_iso()
+    now_iso = now_iso or _utc_now_iso()
     task = {
         "task_id": task_id,
         "labels": {},
@@ -446,17 +773,21 @@ def _ensure_task(contract: MutableMapping[str, Any], task_id: str) -> Dict[str,
         "asset_ids": [],
     }
     tasks.append(task)
+    index[task_id] = task
     return task
 
 
-def _ensure_asset(contract: MutableMapping[str, Any], asset_id: str, task_id: str) -> Dict[str, Any]:
+def _ensure_asset(
+    contract: MutableMapping[str, Any], asset_id: str, task_id: str, now_iso: str | None = None
+) -> Dict[str, Any]:
     assets = contract.setdefault("assets", [])
     assert isinstance(assets, list)
-    for asset in assets:
-        if str(asset.get("asset_id")) == asset_id:
-            return asset
+    index = _record_index(contract, "assets", "asset_id", _ASSET_IDX_KEY)
+    existing = index.get(asset_id)
+    if existing is not None:
+        return existing
 
-    now_iso = _utc_now_iso()
+    now_iso = now_iso or _utc_now_iso()
     asset = {
         "asset_id": asset_id,
         "task_id": task_id,
@@ -479,6 +810,7 @@ def _ensure_asset(contract: MutableMapping[str, Any], asset_id: str, task_id: st
         "error": None,
     }
     assets.append(asset)
+    index[asset_id] = asset
     return asset
 
 
@@ -488,9 +820,10 @@ def _set_task_status(
     task_id: str,
     status: str,
     error: Mapping[str, Any] | None = None,
+    now_iso: str | None = None,
 ) -> None:
-    task = _ensure_task(contract, task_id)
-    now_iso = _utc_now_iso()
+    now_iso = now_iso or _utc_now_iso()
+    task = _ensure_task(contract, task_id, now_iso)
     if status == "running" and not task.get("started_at"):
         task["started_at"] = now_iso
     if status in {"succeeded", "failed", "succeeded_with_missing_outputs", "succeeded_with_corrupt_outputs", "succeeded_with_unverified_outputs"}:
@@ -511,11 +844,14 @@ def _set_task_status(
                 asset["error"] = dict(error)
 
 
-def _gsutil_ls(pattern: str) -> Tuple[List[str] | None, str]:
+def _gsutil_ls(pattern: str, *, recursive: bool = True) -> Tuple[List[str] | None, str]:
+    client = _gcs_client()
+    if client is not None:
+        return _gcs_client_ls(client, pattern, recursive=recursive)
     if not _command_exists("gsutil"):
         return (None, "gsutil_unavailable")
 
-    cmd = ["gsutil", "ls", "-r", pattern]
+    cmd = ["gsutil", "ls", "-r", pattern] if recursive else ["gsutil", "ls", pattern]
     proc = subprocess.run(cmd, capture_output=True, text=True)
     if proc.returncode != 0:
         stderr = (proc.stderr or "").strip().replace("\n", " ")
@@ -523,19 +859,27 @@ def _gsutil_ls(pattern: str) -> Tuple[List[str] | None, str]:
             return ([], "gcs_glob")
         return (None, f"gsutil_ls_failed:{stderr or proc.returncode}")
 
-    out: List[str] = []
+    out: set[str] = set()
     for line in (proc.stdout or "").splitlines():
         item = line.strip()
         if not item or not item.startswith("gs://"):
             continue
         if item.endswith("/"):
             continue
-        out.append(_normalize_gs_uri(item))
+        out.add(_normalize_gs_uri(item))
 
-    return (sorted(set(out)), "gcs_glob")
+    # Deduplicated but unsorted; callers that need a stable order sort once.
+    return (list(out), "gcs_glob")
 
 
 def _gsutil_exists(uri: str) -> Tuple[bool | None, str]:
+    client = _gcs_client()
+    if client is not None:
+        bucket, key = _split_gs_uri(uri)
+        try:
+            return (client.bucket(bucket).blob(key).exists(), "gcs_uri")
+        except Exception as exc:
+            return (None, f"gcs_stat_failed:{exc}")
     if not _command_exists("gsutil"):
         return (None, "gsutil_unavailable")
 
@@ -545,7 +889,57 @@ def _gsutil_exists(uri: str) -> Tuple[bool | None, str]:
     return (False, "gcs_uri")
 
 
-def _asset_exists(asset: Mapping[str, Any]) -> Tuple[bool | None, str, List[str]]:
+def _bulk_existence_probe(assets: Iterable[Mapping[str, Any]]) -> Dict[str, set[str]]:
+    """List each GCS folder holding several gs:// uri assets once.
+
+    Returns folder -> set of object URIs directly under it. Folders that hold a
+    single asset, or whose listing failed, are left out so _asset_exists falls
+    back to a per-object stat for them.
+    """
+    counts: Dict[str, int] = {}
+    for asset in assets:
+        uri = asset.get("uri")
+        if asset.get("local_path") or not (uri and str(uri).startswith("gs://")):
+            continue
+        folder = _gcs_folder(asset)
+        if folder is not None:
+            counts[folder] = counts.get(folder, 0) + 1
+
+    known: Dict[str, set[str]] = {}
+    for folder, count in counts.items():
+        if count < 2:
+            continue
+        found, _reason = _gsutil_ls(folder + "/", recursive=False)
+        if found is not None:
+            known[folder] = set(found)
+    return known
+
+
+def _smallest_unique(items: Iterable[str], limit: int) -> List[str]:
+    """sorted(set(items))[:limit] while holding at most `limit` items."""
+    kept: List[str] = []
+    for item in items:
+        if len(kept) == limit and item >= kept[-1]:
+            continue
+        i = bisect.bisect_left(kept, item)
+        if i < len(kept) and kept[i] == item:
+            continue
+        kept.insert(i, item)
+        if len(kept) > limit:
+            kept.pop()
+    return kept
+
+
+def _asset_exists(
+    asset: Mapping[str, Any],
+    known: Mapping[str, set[str]] | None = None,
+    limit: int | None = None,
+) -> Tuple[bool | None, str, List[str]]:
+    """(exists, reason, matched) for one asset.
+
+    With `limit`, glob matches are capped at the first `limit` sorted paths
+    and never fully materialized (local globs are streamed).
+    """
     local_path = asset.get("local_path")
     uri = asset.get("uri")
     local_glob = asset.get("local_glob")
@@ -558,28 +952,63 @@ def _asset_exists(asset: Mapping[str, Any]) -> Tuple[bool | None, str, List[str]
 
     if uri and str(uri).startswith("gs://"):
         normalized_uri = _normalize_gs_uri(str(uri))
+        listed = known.get(normalized_uri.rsplit("/", 1)[0]) if known else None
+        if listed is not None:
+            exists = normalized_uri in listed
+            return (exists, "gcs_uri", [normalized_uri] if exists else [])
         exists, reason = _gsutil_exists(normalized_uri)
         return (exists, reason, [normalized_uri] if exists else [])
 
     if local_glob:
-        matches = sorted(
-            {
-                _normalize_local_path(path)
-                for path in glob.glob(str(local_glob), recursive=True)
-                if Path(path).is_file()
-            }
+        found = (
+            _normalize_local_path(path)
+            for path in glob.iglob(str(local_glob), recursive=True)
+            if os.path.isfile(path)
         )
+        matches = sorted(set(found)) if limit is None else _smallest_unique(found, limit)
         return (bool(matches), "local_glob", matches)
 
     if gcs_glob:
         matches, reason = _gsutil_ls(str(gcs_glob))
         if matches is None:
             return (None, reason, [])
+        matches = sorted(matches) if limit is None else _smallest_unique(matches, limit)
         return (bool(matches), reason, matches)
 
     return (None, "no_location", [])
 
 
+def _verify_all(
+    assets: List[Mapping[str, Any]],
+    known: Mapping[str, set[str]] | None = None,
+    limit: int | None = None,
+) -> List[Tuple[bool | None, str, List[str]]]:
+    """_asset_exists for every asset, run concurrently; results keep input order.
+
+    Assets with identical location fields are probed once and share the result.
+    """
+    keys = [
+        (asset.get("uri"), asset.get("local_path"), asset.get("local_glob"), asset.get("gcs_glob"))
+        for asset in assets
+    ]
+    unique: Dict[Tuple[Any, ...], Mapping[str, Any]] = {}
+    for key, asset in zip(keys, assets):
+        unique.setdefault(key, asset)
+    # Mirrors _asset_exists' dispatch: local_path wins, then uri, local_glob, gcs_glob.
+    hits_gcs = any(
+        not local_path and (str(uri or "").startswith("gs://") or (bool(gcs_glob) and not local_glob))
+        for uri, local_path, local_glob, gcs_glob in unique
+    )
+    workers = _pool_workers(len(unique), MAX_PROBE_WORKERS, gcs=hits_gcs)
+    if workers == 1:
+        results = [_asset_exists(asset, known, limit) for asset in unique.values()]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(lambda asset: _asset_exists(asset, known, limit), unique.values()))
+    by_key = dict(zip(unique, results))
+    return [by_key[key] for key in keys]
+
+
 def _read_json_from_asset(asset: Mapping[str, Any], *, max_bytes: int = 2_000_000) -> Dict[str, Any] | None:
     local_path = asset.get("local_path")
     uri = asset.get("uri")
@@ -591,11 +1020,21 @@ def _read_json_from_asset(asset: Mapping[str, Any], *, max_bytes: int = 2_000_00
         try:
             if path.stat().st_size > max_bytes:
                 return None
-            return json.loads(path.read_text(encoding="utf-8"))
+            return _json_loads(path.read_bytes())
         except Exception:
             return None
 
     if uri and str(uri).startswith("gs://"):
+        client = _gcs_client()
+        if client is not None:
+            bucket, key = _split_gs_uri(str(uri))
+            try:
+                blob = client.bucket(bucket).get_blob(key)
+                if blob is None or (blob.size or 0) > max_bytes:
+                    return None
+                return _json_loads(blob.download_as_bytes().decode("utf-8", errors="replace"))
+            except Exception:
+                return None
         if not _command_exists("gsutil"):
             return None
         proc = subprocess.run(["gsutil", "cat", str(uri)], capture_output=True)
@@ -605,15 +1044,38 @@ def _read_json_from_asset(asset: Mapping[str, Any], *, max_bytes: int = 2_000_00
         if len(data) > max_bytes:
             return None
         try:
-            return json.loads(data.decode("utf-8", errors="replace"))
+            return _json_loads(data.decode("utf-8", errors="replace"))
         except Exception:
             return None
 
     return None
 
 
+def _scan_local_dir(dir_path: str, resolved_dir: str) -> Tuple[List[str], List[Tuple[str, str]]]:
+    """One os.scandir level: (files, subdirs) with canonical paths."""
+    files: List[str] = []
+    subdirs: List[Tuple[str, str]] = []
+    try:
+        entries = list(os.scandir(dir_path))
+    except OSError:
+        return files, subdirs
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append((entry.path, os.path.join(resolved_dir, entry.name)))
+            elif entry.is_file():
+                if entry.is_symlink():
+                    files.append(_normalize_local_path(entry.path))
+                else:
+                    files.append(os.path.join(resolved_dir, entry.name))
+        except OSError:
+            continue
+    return files, subdirs
+
+
 def _scan_local_files(paths: Iterable[str]) -> List[str]:
     out: set[str] = set()
+    frontier: List[Tuple[str, str]] = []
     for raw in paths:
         if not raw:
             continue
@@ -623,9 +1085,29 @@ def _scan_local_files(paths: Iterable[str]) -> List[str]:
         if root.is_file():
             out.add(_normalize_local_path(str(root)))
             continue
-        for file_path in root.rglob("*"):
-            if file_path.is_file():
-                out.add(_normalize_local_path(str(file_path)))
+        frontier.append((str(root), _normalize_local_path(str(root))))
+
+    # Walk with os.scandir so the common case needs no stat per entry.
+    # Like Path.rglob, symlinked directories are not descended into, so the
+    # resolved root plus a relative path is already canonical; only
+    # symlinked files need resolving. Each level's directories are listed
+    # concurrently.
+    pool: ThreadPoolExecutor | None = None
+    try:
+        while frontier:
+            if len(frontier) == 1:
+                levels = [_scan_local_dir(*frontier[0])]
+            else:
+                if pool is None:
+                    pool = ThreadPoolExecutor(max_workers=MAX_PROBE_WORKERS)
+                levels = list(pool.map(lambda item: _scan_local_dir(*item), frontier))
+            frontier = []
+            for files, subdirs in levels:
+                out.update(files)
+                frontier.extend(subdirs)
+    finally:
+        if pool is not None:
+            pool.shutdown()
     return sorted(out)
 
 
@@ -633,7 +1115,7 @@ def _scan_gcs_files(prefixes: Iterable[str]) -> List[str]:
     out: set[str] = set()
     if not prefixes:
         return []
-    if not _command_exists("gsutil"):
+    if _gcs_client() is None and not _command_exists("gsutil"):
         return []
 
     for raw in prefixes:
@@ -644,8 +1126,7 @@ def _scan_gcs_files(prefixes: Iterable[str]) -> List[str]:
         found, _reason = _gsutil_ls(pattern)
         if found is None:
             continue
-        for item in found:
-            out.add(_normalize_gs_uri(item))
+        out.update(found)
     return sorted(out)
 
 
@@ -653,6 +1134,16 @@ def _upload_contract_to_gcs(local_path: Path, gcs_dest: str) -> Tuple[bool, str
     """Upload a single _run_contract.json to a GCS path."""
     if not gcs_dest.startswith("gs://"):
         return (False, "gcs_dest must start with gs://")
+    client = _gcs_client()
+    if client is not None:
+        bucket, key = _split_gs_uri(gcs_dest)
+        try:
+            client.bucket(bucket).blob(key, chunk_size=GCS_UPLOAD_CHUNK_SIZE).upload_from_filename(
+                str(local_path), content_type="application/json"
+            )
+        except Exception as exc:
+            return (False, f"failed upload to {gcs_dest}: {exc}")
+        return (True, None)
     if not _command_exists("gsutil"):
         return (False, "gsutil not available")
     proc = subprocess.run(
@@ -665,6 +1156,33 @@ def _upload_contract_to_gcs(local_path: Path, gcs_dest: str) -> Tuple[bool, str
     return (True, None)
 
 
+def _upload_contract_bytes_to_gcs(data: bytes, gcs_dest: str) -> Tuple[bool, str | None]:
+    """Upload an already-serialized contract to a GCS path without a local file."""
+    if not gcs_dest.startswith("gs://"):
+        return (False, "gcs_dest must start with gs://")
+    client = _gcs_client()
+    if client is not None:
+        bucket, key = _split_gs_uri(gcs_dest)
+        try:
+            client.bucket(bucket).blob(key, chunk_size=GCS_UPLOAD_CHUNK_SIZE).upload_from_string(
+                data, content_type="application/json"
+            )
+        except Exception as exc:
+            return (False, f"failed upload to {gcs_dest}: {exc}")
+        return (True, None)
+    if not _command_exists("gsutil"):
+        return (False, "gsutil not available")
+    proc = subprocess.run(
+        # No file name to guess from on stdin; match the client's content type.
+        ["gsutil", "-h", "Content-Type:application/json", "cp", "-", gcs_dest],
+        input=data, capture_output=True,
+    )
+    if proc.returncode != 0:
+        stderr = (proc.stderr or b"").decode(errors="replace").strip().replace("\n", " ")
+        return (False, f"failed upload to {gcs_dest}: {stderr or proc.returncode}")
+    return (True, None)
+
+
 def _gcs_folder(asset: Mapping[str, Any]) -> str | None:
     """Extract the GCS folder from an asset's uri or gcs_glob. Returns None if no GCS location."""
     uri = asset.get("uri")
@@ -688,16 +1206,6 @@ def _gcs_folder(asset: Mapping[str, Any]) -> str | None:
     return None
 
 
-def _group_assets_by_folder(assets: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
-    """Group assets by their GCS folder. Assets without a GCS location are excluded."""
-    groups: Dict[str, List[Dict[str, Any]]] = {}
-    for asset in assets:
-        folder = _gcs_folder(asset)
-        if folder is not None:
-            groups.setdefault(folder, []).append(asset)
-    return groups
-
-
 def _build_folder_contract(
     full_contract: Mapping[str, Any],
     folder_uri: str,
@@ -755,15 +1263,14 @@ def _cmd_init(args: argparse.Namespace) -> int:
     run_id = _safe_slug(run_id)
     job_slug = _safe_slug(job_id)
 
-    run_dir = Path(args.run_dir) if args.run_dir else Path("run_contracts") / job_slug / run_id
-    run_dir = run_dir.expanduser().resolve()
+    run_dir = _resolve_path(args.run_dir or os.path.join("run_contracts", job_slug, run_id))
     contract_file = (
-        Path(args.contract_file).expanduser().resolve()
+        _resolve_path(args.contract_file)
         if args.contract_file
         else run_dir / "_run_contract.json"
     )
 
-    spec_file = Path(args.spec_file).expanduser().resolve() if args.spec_file else None
+    spec_file = _resolve_path(args.spec_file) if args.spec_file else None
     expected_assets_override: List[Mapping[str, Any]] | None = None
     expected_inputs_override: List[Mapping[str, Any]] | None = None
 
@@ -808,17 +1315,6 @@ def _cmd_init(args: argparse.Namespace) -> int:
     if resolved_job_id != job_id:
         job_id = resolved_job_id
 
-    now_iso = _utc_now_iso()
-    tasks, assets = _normalize_tasks_and_assets(
-        job_id=job_id,
-        run_id=run_id,
-        now_iso=now_iso,
-        job_def=job_def,
-        expected_assets_override=expected_assets_override,
-        expected_inputs_override=expected_inputs_override,
-        context=template_ctx,
-    )
-
     # --init-json-file: single file with all init data (preferred)
     # Keys: config, inputs, expected_assets, run_metadata
     # Individual --*-json-file flags override keys from --init-json-file.
@@ -833,22 +1329,23 @@ def _cmd_init(args: argparse.Namespace) -> int:
             if not isinstance(ea, list):
                 raise ValueError("init-json-file 'expected_assets' must be a JSON array")
             expected_assets_override = ea
-            # Re-normalize tasks/assets with the override
-            tasks, assets = _normalize_tasks_and_assets(
-                job_id=job_id, run_id=run_id, now_iso=now_iso,
-                job_def=job_def, expected_assets_override=expected_assets_override,
-                expected_inputs_override=expected_inputs_override, context=template_ctx,
-            )
         if expected_inputs_override is None and "expected_inputs" in _init_bundle:
             ei = _init_bundle["expected_inputs"]
             if not isinstance(ei, list):
                 raise ValueError("init-json-file 'expected_inputs' must be a JSON array")
             expected_inputs_override = ei
-            tasks, assets = _normalize_tasks_and_assets(
-                job_id=job_id, run_id=run_id, now_iso=now_iso,
-                job_def=job_def, expected_assets_override=expected_assets_override,
-                expected_inputs_override=expected_inputs_override, context=template_ctx,
-            )
+
+    # Normalize once, after every override source has been merged.
+    now_iso = _utc_now_iso()
+    tasks, assets = _normalize_tasks_and_assets(
+        job_id=job_id,
+        run_id=run_id,
+        now_iso=now_iso,
+        job_def=job_def,
+        expected_assets_override=expected_assets_override,
+        expected_inputs_override=expected_inputs_override,
+        context=template_ctx,
+    )
 
     config_json = _load_json_file(Path(args.config_json_file).expanduser()) if args.config_json_file else _init_bundle.get("config", {})
     inputs_json = _load_json_file(Path(args.inputs_json_file).expanduser()) if args.inputs_json_file else _init_bundle.get("inputs", {})
@@ -870,7 +1367,12 @@ def _cmd_init(args: argparse.Namespace) -> int:
         spec_file=spec_file,
     )
 
-    _write_contract(contract)
+    # Contracts published to GCS are always canonical; local-only writes stay compact.
+    _write_contract(contract, canonical=bool(args.upload_gcs_dir))
+    # A retry reusing this run dir must not inherit the previous run's queued events.
+    events_file = _events_file(contract_file)
+    for suffix in ("", ".replaying", ".incoming"):
+        events_file.with_name(events_file.name + suffix).unlink(missing_ok=True)
 
     if args.upload_gcs_dir:
         gcs_dest = args.upload_gcs_dir.rstrip("/") + "/_run_contract.json"
@@ -889,39 +1391,58 @@ def _cmd_init(args: argparse.Namespace) -> int:
     return 0
 
 
-def _cmd_record_produced(args: argparse.Namespace) -> int:
-    contract_file = Path(args.contract_file).expanduser().resolve()
-    contract = _load_contract(contract_file)
-
+def _produced_fields(args: argparse.Namespace, now_iso: str) -> Dict[str, Any]:
+    """record-produced / append-event flags as a replayable dict."""
     task_id = str(args.task_id).strip()
     if not task_id:
         raise ValueError("--task-id is required")
 
-    task = _ensure_task(contract, task_id)
+    seed = args.uri or args.local_path or args.local_glob or args.gcs_glob or f"{task_id}:{now_iso}"
+    asset_id = str(args.asset_id or f"{task_id}/produced/{hashlib.sha1(seed.encode('utf-8')).hexdigest()[:12]}")
+
+    extra = None
+    if args.extra_json_file:
+        extra = _load_json_file(Path(args.extra_json_file).expanduser())
+        if not isinstance(extra, dict):
+            raise ValueError("--extra-json-file must be a JSON object")
+
+    return {
+        "task_id": task_id,
+        "asset_id": asset_id,
+        "kind": args.kind,
+        "required": args.required,
+        "uri": args.uri,
+        "local_path": args.local_path,
+        "local_glob": args.local_glob,
+        "gcs_glob": args.gcs_glob,
+        "extra": extra,
+    }
+
+
+def _apply_produced(contract: Dict[str, Any], fields: Mapping[str, Any], now_iso: str) -> str:
+    task_id = str(fields["task_id"])
+    asset_id = str(fields["asset_id"])
+
+    task = _ensure_task(contract, task_id, now_iso)
     if not task.get("started_at"):
-        task["started_at"] = _utc_now_iso()
+        task["started_at"] = now_iso
     if task.get("status") in {"expected", None, ""}:
         task["status"] = "running"
 
-    seed = args.uri or args.local_path or args.local_glob or args.gcs_glob or f"{task_id}:{_utc_now_iso()}"
-    asset_id = str(args.asset_id or f"{task_id}/produced/{hashlib.sha1(seed.encode('utf-8')).hexdigest()[:12]}")
-
-    asset = _ensure_asset(contract, asset_id, task_id)
+    asset = _ensure_asset(contract, asset_id, task_id, now_iso)
     asset["task_id"] = task_id
-    asset["kind"] = str(args.kind or asset.get("kind") or "output")
-    asset["required"] = bool(_parse_bool(args.required, default=bool(asset.get("required", True))))
-    asset["uri"] = args.uri or asset.get("uri")
-    asset["local_path"] = args.local_path or asset.get("local_path")
-    asset["local_glob"] = args.local_glob or asset.get("local_glob")
-    asset["gcs_glob"] = args.gcs_glob or asset.get("gcs_glob")
+    asset["kind"] = str(fields.get("kind") or asset.get("kind") or "output")
+    asset["required"] = bool(_parse_bool(fields.get("required"), default=bool(asset.get("required", True))))
+    asset["uri"] = fields.get("uri") or asset.get("uri")
+    asset["local_path"] = fields.get("local_path") or asset.get("local_path")
+    asset["local_glob"] = fields.get("local_glob") or asset.get("local_glob")
+    asset["gcs_glob"] = fields.get("gcs_glob") or asset.get("gcs_glob")
     asset["expected"] = bool(asset.get("expected", False))
     asset["produced"] = True
     asset["status"] = "produced"
 
-    if args.extra_json_file:
-        extra = _load_json_file(Path(args.extra_json_file).expanduser())
-        if not isinstance(extra, dict):
-            raise ValueError("--extra-json-file must be a JSON object")
+    extra = fields.get("extra")
+    if extra:
         merged = dict(asset.get("extra") or {})
         merged.update(extra)
         asset["extra"] = merged
@@ -930,14 +1451,160 @@ def _cmd_record_produced(args: argparse.Namespace) -> int:
     if asset_id not in task_asset_ids:
         task_asset_ids.append(asset_id)
     task["asset_ids"] = sorted(set(task_asset_ids))
+    return asset_id
+
+
+def _cmd_record_produced(args: argparse.Namespace) -> int:
+    contract_file = _resolve_path(args.contract_file)
+    contract = _load_contract(contract_file)
+
+    now_iso = _utc_now_iso()
+    fields = _produced_fields(args, now_iso)
+    # Queued events are older than this call; apply them first so they can't
+    # later overwrite what is recorded here.
+    claimed_events = _fold_pending_events(contract, contract_file, now_iso)
+    asset_id = _apply_produced(contract, fields, now_iso)
 
     _write_contract(contract)
-    print(f"run_contract record-produced: task={task_id} asset={asset_id}")
+    if claimed_events:
+        claimed_events.unlink(missing_ok=True)
+    print(f"run_contract record-produced: task={fields['task_id']} asset={asset_id}")
+    return 0
+
+
+def _events_file(contract_file: Path) -> Path:
+    return contract_file.with_name(contract_file.name + ".events.jsonl")
+
+
+@contextlib.contextmanager
+def _events_lock(events_file: Path) -> Iterator[None]:
+    """Exclusive lock shared by appenders and claimers of one events file.
+
+    It lives on a separate, never-renamed file: locking the events file itself
+    would not stop a writer that opened it just before a claim renamed it.
+    """
+    if fcntl is None:
+        yield
+        return
+    fd = os.open(str(events_file.with_name(events_file.name + ".lock")), os.O_RDWR | os.O_CREAT, 0o666)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)  # releases the lock
+
+
+def _append_lines(path: Path, data: bytes) -> None:
+    """Append newline-terminated records, starting on a fresh line.
+
+    If a previous writer died mid-line, its fragment is terminated first so it
+    doesn't swallow the record written here.
+    """
+    fd = os.open(str(path), os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o666)
+    try:
+        size = os.fstat(fd).st_size
+        if size and os.pread(fd, 1, size - 1) != b"\n":
+            data = b"\n" + data
+        _write_all(fd, data)
+    finally:
+        os.close(fd)
+
+
+def _cmd_append_event(args: argparse.Namespace) -> int:
+    """record-produced without touching the contract: append one JSONL event.
+
+    The contract is not parsed or rewritten, so the cost stays constant however
+    large it grows. Every command that rewrites the contract (record-produced,
+    mark-task-*, finalize) replays pending events first.
+    """
+    contract_file = _resolve_path(args.contract_file)
+    if not contract_file.exists():
+        raise ValueError(f"Contract file not found: {contract_file}")
+
+    now_iso = _utc_now_iso()
+    event = {"op": "produced", "at": now_iso, **_produced_fields(args, now_iso)}
+    events_file = _events_file(contract_file)
+    with _events_lock(events_file):
+        _append_lines(events_file, _json_dumps_bytes(event, canonical=False))
+
+    print(f"run_contract append-event: task={event['task_id']} asset={event['asset_id']}")
     return 0
 
 
+def _claim_events(events_file: Path) -> Path | None:
+    """Move pending events aside for replay; returns the claimed file, if any.
+
+    Taken under _events_lock, so every complete append lands either in the
+    claim or in a fresh events file for the next replay. A claim left behind
+    by an interrupted run (its contract was never written) is kept, with
+    newer events appended after it.
+    """
+    claimed = events_file.with_name(events_file.name + ".replaying")
+    incoming = events_file.with_name(events_file.name + ".incoming")
+    with _events_lock(events_file):
+        try:
+            os.replace(events_file, incoming)
+        except FileNotFoundError:
+            pass
+        if incoming.exists():
+            if claimed.exists():
+                _append_lines(claimed, incoming.read_bytes())
+                incoming.unlink()
+            else:
+                os.replace(incoming, claimed)
+        return claimed if claimed.exists() else None
+
+
+def _replay_events(contract: Dict[str, Any], events_file: Path, now_iso: str) -> Tuple[int, List[int]]:
+    """Apply append-event records to the contract.
+
+    Returns (applied, skipped line numbers), and accumulates both under the
+    contract's persisted "event_replay" record so the audit trail survives
+    whichever command did the replay. Lines that don't parse, e.g. one cut
+    short by a killed writer, are reported and skipped rather than blocking
+    the run from ever finalizing.
+    """
+    try:
+        data = events_file.read_bytes()
+    except FileNotFoundError:
+        return (0, [])
+    applied = 0
+    skipped: List[int] = []
+    for lineno, line in enumerate(data.splitlines(), 1):
+        if not line.strip():
+            continue
+        try:
+            event = _json_loads(line)
+        except ValueError:
+            event = None
+        if not isinstance(event, dict) or event.get("op") != "produced" or not event.get("task_id") or not event.get("asset_id"):
+            print(f"WARNING: skipping unreadable event on line {lineno} of {events_file}", file=sys.stderr)
+            skipped.append(lineno)
+            continue
+        _apply_produced(contract, event, str(event.get("at") or now_iso))
+        applied += 1
+
+    record = contract.setdefault("event_replay", {"applied": 0, "skipped_lines": []})
+    record["applied"] = int(record.get("applied") or 0) + applied
+    record.setdefault("skipped_lines", []).extend(
+        {"line": lineno, "replayed_at": now_iso} for lineno in skipped
+    )
+    return (applied, skipped)
+
+
+def _fold_pending_events(contract: Dict[str, Any], contract_file: Path, now_iso: str) -> Path | None:
+    """Claim and replay queued append-event records into the contract.
+
+    Returns the claim, which the caller unlinks once the contract is written.
+    """
+    claimed = _claim_events(_events_file(contract_file))
+    if claimed is not None:
+        _replay_events(contract, claimed, now_iso)
+    return claimed
+
+
 def _cmd_mark_task(args: argparse.Namespace, *, status: str) -> int:
-    contract_file = Path(args.contract_file).expanduser().resolve()
+    contract_file = _resolve_path(args.contract_file)
     contract = _load_contract(contract_file)
 
     error = None
@@ -946,14 +1613,20 @@ def _cmd_mark_task(args: argparse.Namespace, *, status: str) -> int:
         if not isinstance(error, dict):
             raise ValueError("--error-json-file must be a JSON object")
 
+    # Fold queued append-event records in first, so a failure reaches them
+    # exactly as it reaches assets recorded with record-produced.
+    claimed_events = _fold_pending_events(contract, contract_file, _utc_now_iso())
+
     _set_task_status(contract, task_id=str(args.task_id), status=status, error=error)
     _write_contract(contract)
+    if claimed_events:
+        claimed_events.unlink(missing_ok=True)
     print(f"run_contract mark-task-{status}: task={args.task_id}")
     return 0
 
 
 def _cmd_preflight(args: argparse.Namespace) -> int:
-    contract_file = Path(args.contract_file).expanduser().resolve()
+    contract_file = _resolve_path(args.contract_file)
     contract = _load_contract(contract_file)
 
     assets = contract.get("assets", [])
@@ -964,35 +1637,38 @@ def _cmd_preflight(args: argparse.Namespace) -> int:
     missing_optional: List[str] = []
     ok_count = 0
 
-    for asset in input_assets:
-        exists, exists_reason, matched = _asset_exists(asset)
+    known = _bulk_existence_probe(input_assets)
+    probes = _verify_all(input_assets, known, limit=MATCHED_OUTPUTS_LIMIT)
+    log_lines: List[str] = []
+    for asset, (exists, exists_reason, matched) in zip(input_assets, probes):
         asset["exists"] = exists
         asset["exists_reason"] = exists_reason
         if matched:
-            asset["matched_outputs"] = matched[:200]
+            asset["matched_outputs"] = matched
 
         aid = str(asset.get("asset_id") or "")
         required = bool(asset.get("required", True))
+        loc = asset.get("uri") or asset.get("local_path") or asset.get("local_glob") or asset.get("gcs_glob") or ""
 
         if exists is True:
             asset["status"] = "ok"
             ok_count += 1
             tag = "[OK]     "
-            loc = asset.get("uri") or asset.get("local_path") or asset.get("local_glob") or asset.get("gcs_glob") or ""
-            print(f"  {tag} {aid:<30s} {loc}")
+            suffix = ""
         elif exists is False:
             asset["status"] = "missing"
             if required:
                 missing_required.append(aid)
             else:
                 missing_optional.append(aid)
-            req_label = "(required)" if required else "(optional)"
-            loc = asset.get("uri") or asset.get("local_path") or asset.get("local_glob") or asset.get("gcs_glob") or ""
-            print(f"  [MISSING] {aid:<30s} {loc}  {req_label}")
+            tag = "[MISSING]"
+            suffix = "  (required)" if required else "  (optional)"
         else:
             asset["status"] = "unknown"
-            loc = asset.get("uri") or asset.get("local_path") or asset.get("local_glob") or asset.get("gcs_glob") or ""
-            print(f"  [UNKNOWN] {aid:<30s} {loc}")
+            tag = "[UNKNOWN]"
+            suffix = ""
+        log_lines.append(_PREFLIGHT_LINE_FMT % (tag, aid, loc, suffix))
+    sys.stdout.writelines(log_lines)
 
     contract["preflight"] = {
         "checked_at": now_iso,
@@ -1004,7 +1680,8 @@ def _cmd_preflight(args: argparse.Namespace) -> int:
         "missing_optional_count": len(missing_optional),
     }
 
-    _write_contract(contract)
+    # Contracts published to GCS are always canonical; local-only writes stay compact.
+    _write_contract(contract, canonical=bool(args.upload_gcs_dir))
 
     if args.upload_gcs_dir:
         contract_path = Path(str(contract.get("paths", {}).get("contract_json") or contract_file))
@@ -1026,11 +1703,12 @@ def _cmd_preflight(args: argparse.Namespace) -> int:
 
 
 def _cmd_finalize(args: argparse.Namespace) -> int:
-    contract_file = Path(args.contract_file).expanduser().resolve()
+    contract_file = _resolve_path(args.contract_file)
     contract = _load_contract(contract_file)
 
     audit_corruption = _parse_bool(args.audit_corruption, default=True)
     now_iso = _utc_now_iso()
+    claimed_events = _fold_pending_events(contract, contract_file, now_iso)
 
     tasks = contract.get("tasks", [])
     assets = contract.get("assets", [])
@@ -1040,6 +1718,7 @@ def _cmd_finalize(args: argparse.Namespace) -> int:
     # Ensure task references are consistent.
     for task in tasks:
         task.setdefault("asset_ids", [])
+    task_asset_id_sets: Dict[str, set[str]] = {}
     for asset in assets:
         tid = str(asset.get("task_id") or "")
         aid = str(asset.get("asset_id") or "")
@@ -1047,23 +1726,39 @@ def _cmd_finalize(args: argparse.Namespace) -> int:
             tid = "unassigned"
             asset["task_id"] = tid
         if tid not in task_map:
-            task_map[tid] = _ensure_task(contract, tid)
-        asset_ids = list(task_map[tid].get("asset_ids") or [])
-        if aid and aid not in asset_ids:
-            asset_ids.append(aid)
-            task_map[tid]["asset_ids"] = sorted(set(asset_ids))
+            task_map[tid] = _ensure_task(contract, tid, now_iso)
+        if aid:
+            seen = task_asset_id_sets.get(tid)
+            if seen is None:
+                seen = task_asset_id_sets[tid] = set(task_map[tid].get("asset_ids") or [])
+            if aid not in seen:
+                seen.add(aid)
+                task_map[tid]["asset_ids"] = sorted(seen)
 
     known_existing_locations: set[str] = set()
     missing_required: List[str] = []
     corrupt_required: List[str] = []
     unknown_required: List[str] = []
+    asset_status_counts: Dict[str, int] = {}
+    input_asset_status_counts: Dict[str, int] = {}
+    output_asset_status_counts: Dict[str, int] = {}
+    missing_required_input_ids: List[str] = []
+    folder_groups: Dict[str, List[Dict[str, Any]]] = {}
+    expected_count = produced_count = required_count = 0
+
+    # Single pass: probe results, status, location bookkeeping and counters.
+    known = _bulk_existence_probe(assets)
+    probes = _verify_all(assets, known)
+    for asset, (exists, exists_reason, matched) in zip(assets, probes):
+        uri = asset.get("uri")
+        local_path = asset.get("local_path")
+        required = bool(asset.get("required", True))
+        has_location = bool(uri or local_path or asset.get("local_glob") or asset.get("gcs_glob"))
 
-    for asset in assets:
-        exists, exists_reason, matched = _asset_exists(asset)
         asset["exists"] = exists
         asset["exists_reason"] = exists_reason
         if matched:
-            asset["matched_outputs"] = matched[:200]
+            asset["matched_outputs"] = matched[:MATCHED_OUTPUTS_LIMIT]
 
         corrupt = None
         corrupt_reason = None
@@ -1082,45 +1777,60 @@ def _cmd_finalize(args: argparse.Namespace) -> int:
 
         if asset.get("error"):
             status = "failed"
-        elif exists is False and (
-            asset.get("uri") or asset.get("local_path") or asset.get("local_glob") or asset.get("gcs_glob")
-        ):
+        elif exists is False and has_location:
             status = "missing"
         elif corrupt is True:
             status = "corrupt"
         elif exists is True:
             status = "ok"
-        elif exists is None and (
-            asset.get("uri") or asset.get("local_path") or asset.get("local_glob") or asset.get("gcs_glob")
-        ):
+        elif exists is None and has_location:
             status = "unknown"
         else:
             status = "produced" if asset.get("produced") else "expected"
         asset["status"] = status
 
         if exists is True:
-            if asset.get("local_path"):
-                known_existing_locations.add(_normalize_local_path(str(asset["local_path"])))
-            if asset.get("uri"):
-                known_existing_locations.add(_normalize_gs_uri(str(asset["uri"])))
+            if local_path:
+                known_existing_locations.add(_normalize_local_path(str(local_path)))
+            if uri:
+                known_existing_locations.add(_normalize_gs_uri(str(uri)))
             for item in matched:
                 if str(item).startswith("gs://"):
                     known_existing_locations.add(_normalize_gs_uri(str(item)))
                 else:
                     known_existing_locations.add(_normalize_local_path(str(item)))
 
-        if bool(asset.get("required", True)):
-            aid = str(asset.get("asset_id") or "")
+        aid = str(asset.get("asset_id") or "")
+        if required:
+            required_count += 1
             if status in {"missing", "failed"}:
                 missing_required.append(aid)
             elif status == "corrupt":
                 corrupt_required.append(aid)
             elif status == "unknown":
                 unknown_required.append(aid)
+        if asset.get("expected"):
+            expected_count += 1
+        if asset.get("produced"):
+            produced_count += 1
+
+        asset_status_counts[status] = asset_status_counts.get(status, 0) + 1
+        if str(asset.get("role") or "output") == "input":
+            input_asset_status_counts[status] = input_asset_status_counts.get(status, 0) + 1
+            if required and status in {"missing", "failed"}:
+                missing_required_input_ids.append(aid)
+        else:
+            output_asset_status_counts[status] = output_asset_status_counts.get(status, 0) + 1
+
+        folder = _gcs_folder(asset)
+        if folder is not None:
+            folder_groups.setdefault(folder, []).append(asset)
 
-    discovered_local = _scan_local_files(args.scan_local_dir or [])
-    discovered_gcs = _scan_gcs_files(args.scan_gcs_prefix or [])
-    discovered_all: set[str] = set(discovered_local + discovered_gcs)
+    discovered_all: set[str] = set()
+    if args.scan_local_dir:
+        discovered_all.update(_scan_local_files(args.scan_local_dir))
+    if args.scan_gcs_prefix:
+        discovered_all.update(_scan_gcs_files(args.scan_gcs_prefix))
 
     unexpected_outputs = sorted(discovered_all - known_existing_locations)
 
@@ -1162,26 +1872,11 @@ def _cmd_finalize(args: argparse.Namespace) -> int:
         task["finished_at"] = task.get("finished_at") or now_iso
         task_status_counts[final_status] = task_status_counts.get(final_status, 0) + 1
 
-    asset_status_counts: Dict[str, int] = {}
-    input_asset_status_counts: Dict[str, int] = {}
-    output_asset_status_counts: Dict[str, int] = {}
-    missing_required_input_ids: List[str] = []
-    for asset in assets:
-        st = str(asset.get("status") or "unknown")
-        asset_status_counts[st] = asset_status_counts.get(st, 0) + 1
-        role = str(asset.get("role") or "output")
-        if role == "input":
-            input_asset_status_counts[st] = input_asset_status_counts.get(st, 0) + 1
-            if st in {"missing", "failed"} and bool(asset.get("required", True)):
-                missing_required_input_ids.append(str(asset.get("asset_id") or ""))
-        else:
-            output_asset_status_counts[st] = output_asset_status_counts.get(st, 0) + 1
-
     verification: Dict[str, Any] = {
         "finished_at": now_iso,
-        "expected_assets_count": sum(1 for asset in assets if bool(asset.get("expected"))),
-        "produced_assets_count": sum(1 for asset in assets if bool(asset.get("produced"))),
-        "required_assets_count": sum(1 for asset in assets if bool(asset.get("required", True))),
+        "expected_assets_count": expected_count,
+        "produced_assets_count": produced_count,
+        "required_assets_count": required_count,
         "asset_status_counts": asset_status_counts,
         "input_asset_status_counts": input_asset_status_counts,
         "output_asset_status_counts": output_asset_status_counts,
@@ -1193,6 +1888,10 @@ def _cmd_finalize(args: argparse.Namespace) -> int:
         "unexpected_outputs": unexpected_outputs,
         "unexpected_outputs_count": len(unexpected_outputs),
     }
+    event_replay = contract.get("event_replay")
+    if event_replay:
+        # Accumulated by every command that replayed queued events.
+        verification["event_replay"] = event_replay
 
     if args.verification_json_file:
         extra = _load_json_file(Path(args.verification_json_file).expanduser())
@@ -1218,26 +1917,31 @@ def _cmd_finalize(args: argparse.Namespace) -> int:
         run_meta["output_location"] = args.output_location
 
     contract["verification"] = verification
-    _write_contract(contract)
 
     # ---- Upload contracts to GCS ----
     scope = str(getattr(args, "contract_scope", "folder") or "folder").strip().lower()
     output_location = str(args.output_location or contract.get("run", {}).get("output_location") or "").strip()
-    contract_local = Path(str(contract.get("paths", {}).get("contract_json") or contract_file))
 
     folder_uploads: List[Dict[str, Any]] = []
 
     if scope == "folder" and output_location.startswith("gs://"):
-        # Per-folder: group assets by GCS folder, build filtered contract per folder, upload each.
-        folder_groups = _group_assets_by_folder(assets)
+        # Per-folder: assets were grouped by GCS folder above; build filtered contract per folder, upload each.
         if folder_groups:
-            tmp_dir = Path(tempfile.mkdtemp(prefix="run_contract_folders_"))
-            for folder_uri, folder_assets in sorted(folder_groups.items()):
+
+            def _write_and_upload(item: Tuple[str, List[Dict[str, Any]]]) -> Tuple[str, bool, str | None]:
+                folder_uri, folder_assets = item
                 folder_contract = _build_folder_contract(contract, folder_uri, folder_assets)
-                folder_file = tmp_dir / hashlib.sha1(folder_uri.encode()).hexdigest()[:12] / "_run_contract.json"
-                _atomic_write_json(folder_file, folder_contract)
                 gcs_dest = folder_uri.rstrip("/") + "/_run_contract.json"
-                ok, err = _upload_contract_to_gcs(folder_file, gcs_dest)
+                ok, err = _upload_contract_bytes_to_gcs(_json_dumps_bytes(folder_contract), gcs_dest)
+                return gcs_dest, ok, err
+
+            # Uploads are RTT-bound; run them concurrently, report in folder order.
+            groups = sorted(folder_groups.items())
+            with ThreadPoolExecutor(max_workers=_pool_workers(len(groups), GCS_CLIENT_POOL_SIZE, gcs=True)) as pool:
+                results = list(pool.map(_write_and_upload, groups))
+            out_lines: List[str] = []
+            err_lines: List[str] = []
+            for (folder_uri, folder_assets), (gcs_dest, ok, err) in zip(groups, results):
                 folder_uploads.append({
                     "folder_uri": folder_uri,
                     "gcs_dest": gcs_dest,
@@ -1246,13 +1950,15 @@ def _cmd_finalize(args: argparse.Namespace) -> int:
                     "error": err,
                 })
                 if ok:
-                    print(f"  uploaded: {gcs_dest} ({len(folder_assets)} assets)")
+                    out_lines.append(_FOLDER_UPLOADED_FMT % (gcs_dest, len(folder_assets)))
                 else:
-                    print(f"  FAILED:   {gcs_dest}: {err}", file=sys.stderr)
+                    err_lines.append(_UPLOAD_FAILED_FMT % (gcs_dest, err))
+            sys.stdout.writelines(out_lines)
+            sys.stderr.writelines(err_lines)
         else:
             # No GCS assets found — fallback to single contract at output root.
             gcs_dest = output_location.rstrip("/") + "/_run_contract.json"
-            ok, err = _upload_contract_to_gcs(contract_local, gcs_dest)
+            ok, err = _upload_contract_bytes_to_gcs(_json_dumps_bytes(_contract_payload(contract)), gcs_dest)
             folder_uploads.append({
                 "folder_uri": output_location,
                 "gcs_dest": gcs_dest,
@@ -1267,7 +1973,7 @@ def _cmd_finalize(args: argparse.Namespace) -> int:
     elif scope == "run" and output_location.startswith("gs://"):
         # Single contract at output root.
         gcs_dest = output_location.rstrip("/") + "/_run_contract.json"
-        ok, err = _upload_contract_to_gcs(contract_local, gcs_dest)
+        ok, err = _upload_contract_bytes_to_gcs(_json_dumps_bytes(_contract_payload(contract)), gcs_dest)
         folder_uploads.append({
             "folder_uri": output_location,
             "gcs_dest": gcs_dest,
@@ -1280,12 +1986,20 @@ def _cmd_finalize(args: argparse.Namespace) -> int:
         else:
             print(f"  FAILED:   {gcs_dest}: {err}", file=sys.stderr)
 
+    # Written once, after uploads, so folder_uploads lands in the same write.
     if folder_uploads:
         verification["folder_uploads"] = folder_uploads
-        contract["verification"] = verification
-        _write_contract(contract)
+    _write_contract(contract, canonical=True)
+    if claimed_events:
+        # Folded into the contract on disk; drop them so a re-run doesn't re-apply.
+        claimed_events.unlink(missing_ok=True)
 
     print(f"run_contract finalize: {contract_file}")
+    if event_replay:
+        print(
+            f"replayed_events={event_replay.get('applied', 0)} "
+            f"skipped_events={len(event_replay.get('skipped_lines') or [])}"
+        )
     print(
         "required_missing="
         f"{len(verification.get('missing_required_asset_ids') or [])} "
@@ -1328,6 +2042,14 @@ def _gsutil_stat(uri: str) -> Tuple[bool, int | None]:
 
     Returns (exists, size_bytes).
     """
+    client = _gcs_client()
+    if client is not None:
+        bucket, key = _split_gs_uri(uri)
+        try:
+            blob = client.bucket(bucket).get_blob(key)
+        except Exception:
+            return (False, None)
+        return (False, None) if blob is None else (True, blob.size)
     if not _command_exists("gsutil"):
         return (False, None)
     proc = subprocess.run(["gsutil", "stat", uri], capture_output=True, text=True)
@@ -1357,6 +2079,13 @@ def _format_size(size_bytes: int | None) -> str:
 
 def _download_gcs_contract(uri: str) -> Dict[str, Any] | None:
     """Download a _run_contract.json from GCS and parse it."""
+    client = _gcs_client()
+    if client is not None:
+        bucket, key = _split_gs_uri(uri)
+        try:
+            return _json_loads(client.bucket(bucket).blob(key).download_as_bytes())
+        except Exception:
+            return None
     if not _command_exists("gsutil"):
         return None
     with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as tmp:
@@ -1367,7 +2096,7 @@ def _download_gcs_contract(uri: str) -> Dict[str, Any] | None:
         )
         if proc.returncode != 0:
             return None
-        return json.loads(Path(tmp_path).read_text(encoding="utf-8"))
+        return _load_json_file(Path(tmp_path))
     except Exception:
         return None
     finally:
@@ -1468,7 +2197,7 @@ def _cmd_extract_retry_scope(args: argparse.Namespace) -> int:
     elif args.contract_file:
         source_label = str(Path(args.contract_file).resolve())
         print(f"run_contract extract-retry-scope: reading {source_label}")
-        contract = json.loads(Path(args.contract_file).read_text(encoding="utf-8"))
+        contract = _load_json_file(Path(args.contract_file))
     else:
         raise ValueError("Either --contract-file or --gcs-contract is required")
 
@@ -1584,17 +2313,21 @@ def _build_parser() -> argparse.ArgumentParser:
     p_pre.set_defaults(func=_cmd_preflight)
 
     p_prod = sub.add_parser("record-produced", help="Upsert a produced asset")
-    p_prod.add_argument("--contract-file", required=True)
-    p_prod.add_argument("--task-id", required=True)
-    p_prod.add_argument("--asset-id", help="Asset id (optional; deterministic hash if omitted)")
-    p_prod.add_argument("--kind", help="Asset kind (default: output)")
-    p_prod.add_argument("--required", help="true|false (default: keep existing or true)")
-    p_prod.add_argument("--uri", help="gs:// URI")
-    p_prod.add_argument("--local-path", help="Local file path")
-    p_prod.add_argument("--local-glob", help="Local glob pattern")
-    p_prod.add_argument("--gcs-glob", help="GCS glob pattern")
-    p_prod.add_argument("--extra-json-file", help="File containing JSON object merged into asset.extra")
+    p_event = sub.add_parser("append-event",
+                             help="Queue a produced asset in <contract>.events.jsonl; applied by finalize")
+    for p_asset in (p_prod, p_event):
+        p_asset.add_argument("--contract-file", required=True)
+        p_asset.add_argument("--task-id", required=True)
+        p_asset.add_argument("--asset-id", help="Asset id (optional; deterministic hash if omitted)")
+        p_asset.add_argument("--kind", help="Asset kind (default: output)")
+        p_asset.add_argument("--required", help="true|false (default: keep existing or true)")
+        p_asset.add_argument("--uri", help="gs:// URI")
+        p_asset.add_argument("--local-path", help="Local file path")
+        p_asset.add_argument("--local-glob", help="Local glob pattern")
+        p_asset.add_argument("--gcs-glob", help="GCS glob pattern")
+        p_asset.add_argument("--extra-json-file", help="File containing JSON object merged into asset.extra")
     p_prod.set_defaults(func=_cmd_record_produced)
+    p_event.set_defaults(func=_cmd_append_event)
 
     p_running = sub.add_parser("mark-task-running", help="Mark task as running")
     p_running.add_argument("--contract-file", required=True)
@@ -1652,6 +2385,8 @@ def _build_parser() -> argparse.ArgumentParser:
 
 
 def main(argv: List[str] | None = None) -> int:
+    global _STDLIB_JSON_VALUES
+    _STDLIB_JSON_VALUES = False  # per command; inputs re-trigger it when needed
     parser = _build_parser()
     args = parser.parse_args(argv)
 